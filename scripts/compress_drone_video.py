@@ -1,30 +1,52 @@
+import argparse
 import os
 import sys
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from src import compress_drone_video, traverse
-
-dir = input("📁 Enter directory path: ").strip().strip("'").strip('"')
-
-# Check if directory exists
-if not os.path.exists(dir):
-    print(f"❌ Error: Directory not found: {dir}")
-    print("Please check the path and try again.")
-    sys.exit(1)
-
-if not os.path.isdir(dir):
-    print(f"❌ Error: Path is not a directory: {dir}")
-    sys.exit(1)
-
-# Compress drone videos to 1080p @ 15Mbps (keeps original fps)
-# Compressed files are saved to 'compressed/' subdirectory
-# Original files remain untouched in their original location
-try:
-    traverse(dir, ".mp4", compress_drone_video, "1920:1080", "15M", None)
-    print("\n✅ Processing completed!")
-except KeyboardInterrupt:
-    print("\n⚠️  Processing interrupted by user.")
-except Exception as e:
-    print(f"\n❌ An error occurred: {e}")
-    print("Some files may have been processed successfully.")
\ No newline at end of file
+from src import compress_drone_video, limit_parallel_jobs, traverse
+
+
+def main():
+    """Prompt for a directory and compress the drone videos in it."""
+    parser = argparse.ArgumentParser(description="Compress drone videos to 1080p @ 15Mbps")
+    parser.add_argument(
+        "--threadcount",
+        type=int,
+        default=max(1, (os.cpu_count() or 2) // 2),
+        help="Number of videos compressed in parallel (default: half of CPU cores, FFmpeg is multi-threaded itself; "
+             "capped to the NVENC session limit when encoding on an NVIDIA GPU)",
+    )
+    args = parser.parse_args()
+
+    dir = input("📁 Enter directory path: ").strip().strip("'").strip('"')
+
+    # Check if directory exists
+    if not os.path.exists(dir):
+        print(f"❌ Error: Directory not found: {dir}")
+        print("Please check the path and try again.")
+        sys.exit(1)
+
+    if not os.path.isdir(dir):
+        print(f"❌ Error: Path is not a directory: {dir}")
+        sys.exit(1)
+
+    # Compress drone videos to 1080p @ 15Mbps (keeps original fps)
+    # Compressed files are saved to 'compressed/' subdirectory
+    # Original files remain untouched in their original location
+    try:
+        # Consumer NVIDIA GPUs only allow a few concurrent NVENC sessions
+        parallel = limit_parallel_jobs(args.threadcount)
+        traverse(dir, ".mp4", compress_drone_video, "1920:1080", "15M", None, parallel=parallel)
+        print("\n✅ Processing completed!")
+    except KeyboardInterrupt:
+        print("\n⚠️  Processing interrupted by user.")
+    except Exception as e:
+        print(f"\n❌ An error occurred: {e}")
+        print("Some files may have been processed successfully.")
+
+
+# Worker processes re-import this module under the spawn/forkserver start methods,
+# so the prompt and processing must only run in the main process
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import compress_drone_video, find_files, limit_parallel_jobs, process_files
+
+
+def main():
+    """Compress the drone videos of a directory, split across MPI ranks."""
+    parser = argparse.ArgumentParser(
+        description="Compress drone videos to 1080p @ 15Mbps across MPI ranks",
+        epilog="Example: mpirun -n 8 python3 compress_drone_video_mpi.py /path/to/videos\n"
+               "Each rank compresses its videos one at a time; "
+               "start more ranks for more parallelism (forking worker processes after MPI_Init is unsafe).",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("directory", help="Directory containing the drone videos")
+    parser.add_argument("--recursive", action="store_true", help="Also process subdirectories")
+    args = parser.parse_args()
+
+    try:
+        from mpi4py import MPI
+    except ImportError:
+        print("❌ Error: mpi4py is required for distributed compression (pip install mpi4py)")
+        sys.exit(1)
+
+    comm = MPI.COMM_WORLD
+    rank = comm.Get_rank()
+    size = comm.Get_size()
+
+    # Ranks sharing this node run FFmpeg concurrently: they split the CPU cores between them
+    # and together must stay within the NVENC session limit
+    node_comm = comm.Split_type(MPI.COMM_TYPE_SHARED)
+    node_ranks = node_comm.Get_size()
+    session_limit = limit_parallel_jobs(node_ranks)
+    if node_comm.Get_rank() == 0 and session_limit < node_ranks:
+        print(f"⚠️  {node_ranks} ranks on {MPI.Get_processor_name()} exceed the NVENC session limit "
+              f"({session_limit}); start at most {session_limit} ranks per node")
+
+    # Rank 0 scans the directory and deals the files out round-robin, one chunk per rank
+    chunks = None
+    dir_ok = True
+    if rank == 0:
+        dir = args.directory.strip().strip("'").strip('"')
+        if not os.path.isdir(dir):
+            print(f"❌ Error: Directory not found: {dir}")
+            dir_ok = False
+        else:
+            paths = list(find_files(dir, ".mp4", args.recursive))
+            print(f"📁 Found {len(paths)} videos, distributing across {size} ranks")
+            chunks = [paths[i::size] for i in range(size)]
+
+    # Every rank must learn about the error so they all exit non-zero
+    if not comm.bcast(dir_ok, root=0):
+        sys.exit(1)
+
+    chunk = comm.scatter(chunks, root=0)
+
+    # Compressed files are saved to 'compressed/' subdirectory
+    # Original files remain untouched in their original location
+    process_files(chunk, compress_drone_video, "1920:1080", "15M", None, jobs=node_ranks)
+
+    comm.Barrier()
+    if rank == 0:
+        print("\n✅ Processing completed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,14 +20,22 @@ Examples:
 """
 
 import argparse
+import ctypes
 import os
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-# Common image format subdirectories to search
-# Empty string represents the base directory itself
-IMAGE_SUBDIRS = ['', 'heif', 'hif', 'jpeg', 'jpg', 'HEIF', 'HIF', 'JPEG', 'JPG']
+# Common image format subdirectories to search besides the base directory
+# Names are casefolded, so 'JPG', 'Jpeg', etc. match as well
+IMAGE_SUBDIRS = frozenset({'heif', 'hif', 'jpeg', 'jpg'})
+
+# Number of files copied concurrently
+COPY_WORKERS = 16
+
+# Buffer size for the plain copy fallback (shutil's own default before Python 3.14 is smaller)
+COPY_BUFSIZE = 256 * 1024
 
 
 def get_target_directory():
@@ -88,6 +96,112 @@ Examples:
                     print(f"Error: '{target_dir}' does not exist or is not a directory.")
                     print("Please try again or press Enter to use current directory.")
 
+
+def _iter_files(path):
+    """
+    Yield regular file entries of a directory using os.scandir.
+    Hidden/system files (e.g. .DS_Store) are skipped by name before any other check.
+    
+    Args:
+        path: Directory to scan
+        
+    Yields:
+        os.DirEntry: Entries that are regular files (symlinks are not followed)
+    """
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.name[:1] == '.':
+                continue
+            if entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+def _find_matches(entries, raw_file_names, prefix):
+    """
+    Collect file entries whose name (without extension) is in raw_file_names.
+    
+    Args:
+        entries: Iterable of os.DirEntry file entries
+        raw_file_names (frozenset): Casefolded file names to match
+        prefix: Display prefix for matches (e.g. "jpg/")
+        
+    Returns:
+        list: Matching os.DirEntry objects
+    """
+    matches = []
+    for entry in entries:
+        # Casefold once per entry for case-insensitive matching
+        file_stem = os.path.splitext(entry.name)[0].casefold()
+        if file_stem in raw_file_names:
+            matches.append(entry)
+            print(f"   ✓ Match: {prefix}{entry.name}")
+    return matches
+
+
+def _copy_range(copy_fn, src_fd, dst_fd, size):
+    """
+    Copy a whole file with an in-kernel copy function (os.copy_file_range / os.sendfile).
+    
+    Args:
+        copy_fn: Callable (src_fd, dst_fd, offset, count) -> bytes copied
+        src_fd: Source file descriptor
+        dst_fd: Destination file descriptor
+        size: Source file size, used as block size hint
+        
+    Returns:
+        bool: True if copied, False if unsupported (or nothing copied) before any data was written
+    """
+    offset = 0
+    blocksize = max(size, 2 ** 23)
+    while True:
+        try:
+            copied = copy_fn(src_fd, dst_fd, offset, blocksize)
+        except OSError:
+            # Not supported for this file system/kernel: let the caller fall back
+            if offset == 0:
+                return False
+            raise
+        if copied == 0:
+            # Some file systems report 0 on a non-empty file instead of failing
+            if offset == 0 and size > 0:
+                return False
+            return True
+        offset += copied
+
+
+def _fastcopy(src, dst):
+    """
+    Copy a file like shutil.copy2, using zero-copy kernel paths where available.
+    
+    Tries os.copy_file_range (Linux 4.5+, may reflink or copy server-side), then
+    os.sendfile, then a plain copy with a 256 KiB buffer. On macOS shutil.copyfile already uses
+    fcopyfile (cloning on APFS). On Windows the copy is handed to CopyFileW, which
+    lets SMB shares copy server-side. Permission bits and timestamps are preserved.
+    
+    Args:
+        src: Source file path
+        dst: Destination file path
+    """
+    if sys.platform == 'win32':
+        # CopyFileW also copies attributes and timestamps; fall through to the portable path on failure
+        if ctypes.windll.kernel32.CopyFileW(os.fspath(src), os.fspath(dst), False):
+            return
+    if sys.platform == 'darwin':
+        shutil.copyfile(src, dst)
+    else:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+            size = os.fstat(src_fd).st_size
+            copied = False
+            if hasattr(os, 'copy_file_range'):
+                copied = _copy_range(lambda s, d, off, n: os.copy_file_range(s, d, n, off, off), src_fd, dst_fd, size)
+            if not copied and hasattr(os, 'sendfile') and sys.platform.startswith('linux'):
+                copied = _copy_range(lambda s, d, off, n: os.sendfile(d, s, off, n), src_fd, dst_fd, size)
+            if not copied:
+                shutil.copyfileobj(fsrc, fdst, length=COPY_BUFSIZE)
+    shutil.copystat(src, dst)
+
+
 def process_files(base_dir):
     """
     Process files in the specified directory.
@@ -135,14 +249,11 @@ def process_files(base_dir):
     raw_file_names = set()
     
     try:
-        for file_path in raw_export_dir.iterdir():
-            if file_path.is_file():
-                # Get filename without extension (lowercase for case-insensitive matching)
-                file_stem = file_path.stem.lower()
-                # Skip system files like .DS_Store
-                if not file_stem.startswith('.'):
-                    raw_file_names.add(file_stem)
-                    print(f"   ✓ Found: {file_path.name}")
+        for entry in _iter_files(raw_export_dir):
+            # Get filename without extension (casefolded for case-insensitive matching)
+            file_stem = os.path.splitext(entry.name)[0].casefold()
+            raw_file_names.add(file_stem)
+            print(f"   ✓ Found: {entry.name}")
     except PermissionError:
         print(f"Error: Permission denied accessing '{raw_export_dir}'")
         return False
@@ -151,47 +262,42 @@ def process_files(base_dir):
         print("   Warning: No valid files found in raw directory.")
         return False
         
+    # Frozen once here; Step 2 only probes it
+    raw_file_names = frozenset(raw_file_names)
     print(f"   📊 Total unique file names: {len(raw_file_names)}")
     
     # Step 2: Find all matching files in target directory and image subdirectories
     print(f"\n{'Step 2: Finding matching files':-<50}")
-    print(f"   Searching in: base directory + {[d for d in IMAGE_SUBDIRS if d]}")
+    print(f"   Searching in: base directory + {sorted(IMAGE_SUBDIRS)} (case-insensitive)")
     matching_files = []
-    searched_dirs = []
+    searched_dirs = [base_dir]
+    visited = set()
     
-    for subdir in IMAGE_SUBDIRS:
-        if subdir:
-            search_dir = base_dir / subdir
-        else:
-            search_dir = base_dir
-        
-        # Skip if directory doesn't exist
-        if not search_dir.exists() or not search_dir.is_dir():
-            continue
-        
-        # Skip raw and featured directories
-        if search_dir.name.lower() in ('raw', 'featured'):
-            continue
-            
-        searched_dirs.append(search_dir)
-        
+    # Scan the base directory once: match its files and pick up image subdirectories
+    try:
+        with os.scandir(base_dir) as it:
+            base_files = []
+            for entry in it:
+                # Skip system files like .DS_Store
+                if entry.name[:1] == '.':
+                    continue
+                if entry.is_file(follow_symlinks=False):
+                    base_files.append(entry)
+                elif entry.name.casefold() in IMAGE_SUBDIRS and entry.is_dir():
+                    # Case variants (or links) may reach the same directory: scan it only once
+                    st = os.stat(entry.path)
+                    if (st.st_dev, st.st_ino) not in visited:
+                        visited.add((st.st_dev, st.st_ino))
+                        searched_dirs.append(entry)
+        matching_files.extend(_find_matches(base_files, raw_file_names, ''))
+    except PermissionError:
+        print(f"   ⚠️  Permission denied: {base_dir}")
+    
+    for subdir in searched_dirs[1:]:
         try:
-            for file_path in search_dir.iterdir():
-                if file_path.is_file():
-                    # Use lowercase for case-insensitive matching
-                    file_stem = file_path.stem.lower()
-                    # Skip system files
-                    if file_stem.startswith('.'):
-                        continue
-                    if file_stem in raw_file_names:
-                        matching_files.append(file_path)
-                        # Show relative path for subdirectory files
-                        if subdir:
-                            print(f"   ✓ Match: {subdir}/{file_path.name}")
-                        else:
-                            print(f"   ✓ Match: {file_path.name}")
+            matching_files.extend(_find_matches(_iter_files(subdir.path), raw_file_names, f"{subdir.name}/"))
         except PermissionError:
-            print(f"   ⚠️  Permission denied: {search_dir}")
+            print(f"   ⚠️  Permission denied: {subdir.path}")
             continue
     
     print(f"   📂 Searched directories: {len(searched_dirs)}")
@@ -215,22 +321,47 @@ def process_files(base_dir):
         failed_count = 0
         skipped_count = 0
         
-        for file_path in matching_files:
-            try:
-                destination = featured_dir / file_path.name
-                # Check for duplicate filenames from different directories
-                if destination.exists():
-                    print(f"   ⏭️  Skipped (already exists): {file_path.name}")
-                    skipped_count += 1
-                    continue
-                shutil.copy2(file_path, destination)
-                # Show source directory for clarity
-                rel_path = file_path.relative_to(base_dir) if file_path.is_relative_to(base_dir) else file_path.name
-                print(f"   ✓ Copied: {rel_path}")
-                copied_count += 1
-            except Exception as e:
-                print(f"   ✗ Failed: {file_path.name} - {e}")
-                failed_count += 1
+        # Check for duplicate filenames from different directories before copying.
+        # Names are casefolded: on case-insensitive file systems (APFS, NTFS) IMG.jpg and
+        # img.JPG are the same destination and must not be written by two threads at once
+        # Existing names are read once, so the result does not depend on earlier runs
+        # on case-sensitive file systems either
+        with os.scandir(featured_dir) as it:
+            existing = {entry.name.casefold() for entry in it}
+        pending = {}
+        for entry in matching_files:
+            name_key = entry.name.casefold()
+            if name_key in pending or name_key in existing:
+                print(f"   ⏭️  Skipped (already exists): {entry.name}")
+                skipped_count += 1
+                continue
+            pending[name_key] = entry
+        
+        # Submit in inode order so large batches are read roughly sequentially from disk
+        # (DirEntry.inode() is cached from scandir on POSIX)
+        copy_order = list(pending.values())
+        if os.name == 'posix':
+            copy_order.sort(key=lambda entry: entry.inode())
+        
+        # Every matched entry lives under base_dir, so its display path is a plain string slice
+        base_prefix = os.path.join(str(base_dir), '')
+        
+        # Copying is I/O bound, so threads overlap the waits
+        with ThreadPoolExecutor(max_workers=COPY_WORKERS) as executor:
+            futures = {
+                executor.submit(_fastcopy, entry.path, featured_dir / entry.name): entry
+                for entry in copy_order
+            }
+            for future in as_completed(futures):
+                entry = futures[future]
+                try:
+                    future.result()
+                    # Show source directory for clarity
+                    print(f"   ✓ Copied: {entry.path[len(base_prefix):]}")
+                    copied_count += 1
+                except Exception as e:
+                    print(f"   ✗ Failed: {entry.name} - {e}")
+                    failed_count += 1
         
         # Summary
         print(f"\n{'SUMMARY':-<50}")
@@ -3,12 +3,13 @@ FFmpeg Python wrapper for video and image compression.
 """
 
 # Core utilities
-from .core import traverse, FileContext
+from .core import traverse, find_files, process_files, FileContext
 
 # Video processing
 from .video_processing import (
     compress_video,
     compress_drone_video,
+    compress_drone_video_multi,
     compress_rate,
     convert_webm_to_mp4,
     get_video_bitrate,
@@ -16,6 +17,7 @@ from .video_processing import (
     get_video_resolution,
     format_file_size,
     print_video_info,
+    limit_parallel_jobs,
 )
 
 # Image processing
@@ -24,10 +26,13 @@ from .image_processing import compress_image
 __all__ = [
     # Core
     "traverse",
+    "find_files",
+    "process_files",
     "FileContext",
     # Video
     "compress_video",
     "compress_drone_video",
+    "compress_drone_video_multi",
     "compress_rate",
     "convert_webm_to_mp4",
     "get_video_bitrate",
@@ -35,6 +40,7 @@ __all__ = [
     "get_video_resolution",
     "format_file_size",
     "print_video_info",
+    "limit_parallel_jobs",
     # Image
     "compress_image",
 ]
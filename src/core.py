@@ -1,7 +1,18 @@
 import os
 import shutil
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterator
+
+# Output subdirectory created next to the processed files
+COMPRESSED_DIR = 'compressed'
+
+# Compressed directories already created by this process
+_ensured_dirs: set[str] = set()
+_ensured_dirs_lock = threading.Lock()
 
 
 class FileContext:
@@ -9,12 +20,8 @@ class FileContext:
     
     original_file = None
     temp_file = None
-    original_file_name = None
-    temp_file_name = None
-
-    def convert_file_name(self, name):
-        """Escape special characters in file names for shell commands."""
-        return name.replace(" ", "\\ ").replace("'", "\\'")
+    # Number of files processed concurrently, lets processing functions share out CPU cores
+    jobs = 1
 
     def __init__(self, original_file: str) -> None:
         self.original_file = original_file
@@ -24,29 +31,35 @@ class FileContext:
         file_name = os.path.basename(original_file)
         name, format = file_name.rsplit(".", 1)
         
-        # Create compressed directory in the same location as original file
-        compressed_dir = os.path.join(file_dir, 'compressed')
-        if not os.path.exists(compressed_dir):
-            os.makedirs(compressed_dir)
+        # Create compressed directory in the same location as original file,
+        # only once per directory for a batch of files
+        self.compressed_dir = os.path.join(file_dir, COMPRESSED_DIR)
+        if self.compressed_dir not in _ensured_dirs:
+            with _ensured_dirs_lock:
+                os.makedirs(self.compressed_dir, exist_ok=True)
+                _ensured_dirs.add(self.compressed_dir)
         
         # Temp file goes to compressed directory
-        self.temp_file = os.path.join(compressed_dir, "{0}-temp.{1}".format(name, format))
-        self.final_file = os.path.join(compressed_dir, file_name)
-
-        self.original_file_name = self.convert_file_name(self.original_file)
-        self.temp_file_name = self.convert_file_name(self.temp_file)
+        self.temp_file = os.path.join(self.compressed_dir, "{0}-temp.{1}".format(name, format))
+        self.final_file = os.path.join(self.compressed_dir, file_name)
 
     def set_format(self, format: str) -> None:
         """Change the output file format."""
         temp_name = os.path.basename(self.temp_file).rsplit(".", 1)[0]
         compressed_dir = os.path.dirname(self.temp_file)
         self.temp_file = os.path.join(compressed_dir, "{}.{}".format(temp_name, format))
-        self.temp_file_name = self.convert_file_name(self.temp_file)
         
         # Update final file format as well
         final_name = os.path.basename(self.original_file).rsplit(".", 1)[0]
         self.final_file = os.path.join(compressed_dir, "{}.{}".format(final_name, format))
 
+    def set_suffix(self, suffix: str) -> None:
+        """Append a suffix to the output file name (e.g. "-1080p"), keeping its format."""
+        compressed_dir = os.path.dirname(self.final_file)
+        final_name, format = os.path.basename(self.final_file).rsplit(".", 1)
+        self.temp_file = os.path.join(compressed_dir, "{}{}-temp.{}".format(final_name, suffix, format))
+        self.final_file = os.path.join(compressed_dir, "{}{}.{}".format(final_name, suffix, format))
+
     def archive_original_file(self) -> None:
         """Archive is no longer needed - original file stays in place."""
         pass
@@ -57,12 +70,84 @@ class FileContext:
             os.remove(self.original_file)
         
     def rename_temp_file(self) -> None:
-        """Rename temp file to final name in compressed directory."""
-        os.rename(self.temp_file, self.final_file)
+        """Rename temp file to final name in compressed directory, replacing any existing file."""
+        os.replace(self.temp_file, self.final_file)
+
+
+def find_files(dir: str, format: str, recursive: bool = False) -> Iterator[str]:
+    """
+    Yield paths of files under dir whose name ends with the given format (case-insensitive).
+    Subdirectories are walked with an explicit stack, so deep trees need no recursion.
+    
+    Args:
+        dir: Directory path to scan
+        format: File extension to match (e.g., ".mp4", ".jpg")
+        recursive: If True, also scan subdirectories
+    """
+    format = format.lower()
+    stack = deque([dir])
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    # Skip hidden files and directories (.DS_Store, ._* sidecars, ...) by name alone
+                    if entry.name[:1] == '.':
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            # Only descend into subdirectories if recursive=True
+                            if recursive:
+                                stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False) and entry.name.lower().endswith(format):
+                            yield entry.path
+                    except (OSError, IOError, PermissionError) as e:
+                        print(f"⚠️  Cannot access {entry.path}: {e}")
+                        continue
+        except (OSError, IOError, PermissionError) as e:
+            print(f"⚠️  Cannot access directory {current}: {e}")
+
+
+def _worker(path: str, func: Callable, var1=None, var2=None, var3=None, jobs: int = 1) -> None:
+    """Process a single file; top-level so it can be pickled for worker processes."""
+    try:
+        ctx = FileContext(path)
+        ctx.jobs = jobs
+        func(ctx, var1, var2, var3)
+    except Exception as e:
+        print(f"⚠️  Error processing file {path}: {e}")
+
+
+def process_files(
+    paths, func: Callable, var1=None, var2=None, var3=None, parallel: int = 1, jobs: int = None
+) -> None:
+    """
+    Process the given files, serially or in parallel worker processes.
+    
+    Args:
+        paths: File paths to process
+        func: Processing function to call for each file
+        var1, var2, var3: Parameters to pass to the processing function (function-specific)
+        parallel: Number of files processed concurrently in worker processes
+                  (func must be a module-level function so it can be pickled)
+        jobs: Total number of files processed concurrently on this machine, used to share
+              out CPU cores (default: parallel; set it when other processes, e.g. MPI ranks,
+              run on the same node)
+    """
+    jobs = jobs or parallel
+    if parallel <= 1:
+        for path in paths:
+            _worker(path, func, var1, var2, var3, jobs)
+        return
+    
+    # Collect matching files first, then dispatch one file per worker process
+    paths = list(paths)
+    with ProcessPoolExecutor(max_workers=parallel) as executor:
+        list(executor.map(_worker, paths, repeat(func), repeat(var1), repeat(var2), repeat(var3), repeat(jobs)))
 
 
 def traverse(
-    dir: str, format: str, func: Callable, var1=None, var2=None, var3=None, recursive=False
+    dir: str, format: str, func: Callable, var1=None, var2=None, var3=None, recursive=False, parallel: int = 1
 ) -> None:
     """
     Traverse directory and process files matching the given format.
@@ -73,6 +158,8 @@ def traverse(
         func: Processing function to call for each matching file
         var1, var2, var3: Parameters to pass to the processing function (function-specific)
         recursive: If True, recursively process subdirectories
+        parallel: Number of files processed concurrently in worker processes
+                  (func must be a module-level function so it can be pickled)
     """
     directory = Path(dir)
     
@@ -85,29 +172,4 @@ def traverse(
         print(f"⚠️  Not a directory: {directory}")
         return
     
-    try:
-        for obj in directory.iterdir():
-            try:
-                obj_relative_path = os.path.join(dir, obj)
-                
-                # Check if file/directory exists before processing
-                if not os.path.exists(obj_relative_path):
-                    print(f"⚠️  Skipping: Path no longer exists - {obj_relative_path}")
-                    continue
-                
-                if not os.path.isfile(obj_relative_path):
-                    # Only recurse into subdirectories if recursive=True
-                    if recursive:
-                        traverse(obj_relative_path, format, func, var1, var2, var3, recursive)
-                elif obj_relative_path.lower().endswith(format.lower()):
-                    try:
-                        ctx = FileContext(obj_relative_path)
-                        func(ctx, var1, var2, var3)
-                    except Exception as e:
-                        print(f"⚠️  Error processing file {obj_relative_path}: {e}")
-                        continue
-            except (OSError, IOError, PermissionError) as e:
-                print(f"⚠️  Cannot access {obj}: {e}")
-                continue
-    except (OSError, IOError, PermissionError) as e:
-        print(f"⚠️  Cannot access directory {directory}: {e}")
+    process_files(find_files(dir, format, recursive), func, var1, var2, var3, parallel)
@@ -1,23 +1,29 @@
+import logging
 import os
+import subprocess
 from .core import FileContext
 
 # ffmpeg
-ffmpeg_bin = "ffmpeg -hide_banner -loglevel warning -stats"
+ffmpeg_bin = ["ffmpeg", "-hide_banner", "-loglevel", "warning", "-stats"]
 
 
-def execute(cmd: str, ctx: FileContext = None) -> bool:
-    logging.info("❗️ executing cmd: {0}".format(cmd))
-    result = os.system(cmd)
+def execute(cmd: list, ctx: FileContext = None) -> bool:
+    logging.info("❗️ executing cmd: {0}".format(subprocess.list2cmdline(cmd)))
+    try:
+        result = subprocess.run(cmd).returncode
+    except OSError as e:
+        logging.error(f"❌ Cannot run {cmd[0]}: {e}")
+        result = -1
     
     # Check command execution result and output file
     if result == 0 and os.path.exists(ctx.temp_file):
         ctx.archive_original_file()
         # ctx.delete_original_file()
         ctx.rename_temp_file()
-        logging.info("✅ succeed: {0}\n\n".format(ctx.original_file_name))
+        logging.info("✅ succeed: {0}\n\n".format(ctx.original_file))
         return True
     else:
-        logging.error(f"❌ Failed to process {ctx.original_file_name}, exit code: {result}")
+        logging.error(f"❌ Failed to process {ctx.original_file}, exit code: {result}")
         # Clean up failed temporary file
         if os.path.exists(ctx.temp_file):
             os.remove(ctx.temp_file)
@@ -36,8 +42,6 @@ def compress_image(ctx: FileContext, scale, extension=None, reserved=None) -> bo
         reserved: Reserved parameter for future use
     """
     ctx.set_format(extension)
-    base, _ = os.path.splitext(ctx.temp_file_name)
-    new_file_name = f"{base}.{extension}"
 
     scale_param = None
     if scale in [None, "original"]:
@@ -45,7 +49,5 @@ def compress_image(ctx: FileContext, scale, extension=None, reserved=None) -> bo
     else:
         scale_param = scale
 
-    cmd = "{0} -i {1} -vf scale={2} -map_metadata 0 {3} -y".format(
-        ffmpeg_bin, ctx.original_file_name, scale_param, new_file_name
-    )
+    cmd = [*ffmpeg_bin, "-i", ctx.original_file, "-vf", f"scale={scale_param}", "-map_metadata", "0", ctx.temp_file, "-y"]
     return execute(cmd, ctx)
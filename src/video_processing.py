@@ -1,17 +1,33 @@
+import copy
+import functools
 import json
 import os
 import subprocess
+from typing import Callable
 
 from .core import FileContext
 
 # ffmpeg
-ffmpeg_bin = "ffmpeg -hide_banner -loglevel error"
+ffmpeg_bin = ["ffmpeg", "-hide_banner", "-loglevel", "error"]
 
 
-def execute(cmd: str, ctx: FileContext = None) -> bool:
+def run(cmd: list) -> int:
+    """Run a command from an argv list without a shell and return its exit code."""
+    try:
+        return subprocess.run(cmd).returncode
+    except OSError as e:
+        print(f"❌ Cannot run {cmd[0]}: {e}")
+        return -1
+
+
+def execute(cmd: list, ctx: FileContext = None) -> bool:
     print(f"🔄 Processing: {os.path.basename(ctx.original_file)}")
-    result = os.system(cmd)
-    
+    result = run(cmd)
+    return finish_output(ctx, result)
+
+
+def finish_output(ctx: FileContext, result: int) -> bool:
+    """Move the temp output of a finished command into place, or clean it up on failure."""
     # Check command execution result and output file
     if result == 0 and os.path.exists(ctx.temp_file):
         # Get file sizes
@@ -23,17 +39,111 @@ def execute(cmd: str, ctx: FileContext = None) -> bool:
         # ctx.delete_original_file()
         ctx.rename_temp_file()
         
-        print(f"✅ Success: {os.path.basename(ctx.original_file)}")
+        print(f"✅ Success: {os.path.basename(ctx.final_file)}")
         print(f"   Size: {format_file_size(original_size)} -> {format_file_size(compressed_size)} (saved {compression_ratio:.1f}%)\n")
         return True
     else:
-        print(f"❌ Failed: {os.path.basename(ctx.original_file)} (exit code: {result})")
+        print(f"❌ Failed: {os.path.basename(ctx.final_file)} (exit code: {result})")
         # Clean up failed temporary file
         if os.path.exists(ctx.temp_file):
             os.remove(ctx.temp_file)
         return False
 
 
+# Concurrent NVENC sessions allowed on consumer (GeForce) GPUs with older drivers
+NVENC_MAX_SESSIONS = 3
+
+
+@functools.lru_cache(maxsize=None)
+def has_nvenc() -> bool:
+    """
+    Check whether NVIDIA NVENC HEVC encoding actually works on this machine.
+    Many static FFmpeg builds list hevc_nvenc without an NVIDIA GPU being present,
+    so a 1-frame test encode is run instead of reading `ffmpeg -encoders`.
+    Detected once per process and cached.
+    """
+    cmd = [
+        *ffmpeg_bin, "-f", "lavfi", "-i", "nullsrc=s=256x256",
+        "-frames:v", "1", "-c:v", "hevc_nvenc", "-f", "null", "-",
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0
+
+
+def limit_parallel_jobs(parallel: int, sessions_per_job: int = 1) -> int:
+    """
+    Cap the number of concurrent FFmpeg processes to the NVENC session limit when NVENC is used.
+    
+    Args:
+        parallel: Requested number of files processed concurrently
+        sessions_per_job: NVENC sessions opened by one FFmpeg process (one per output)
+    """
+    if not has_nvenc():
+        return parallel
+    return max(1, min(parallel, NVENC_MAX_SESSIONS // sessions_per_job))
+
+
+def hwaccel_args(gpu_decode: bool) -> list:
+    """Input options: decode with NVDEC and keep frames in GPU memory."""
+    return ["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"] if gpu_decode else []
+
+
+def scale_filter(gpu_decode: bool) -> str:
+    """Scale filter matching the decode path (frames stay on the GPU with NVDEC)."""
+    return "scale_cuda" if gpu_decode else "scale"
+
+
+def run_with_decode_fallback(build_cmd: Callable[[bool], list]) -> int:
+    """
+    Run an FFmpeg command with NVDEC decoding when NVENC is used, retrying once with CPU decoding.
+    NVDEC can't decode every source (e.g. 10-bit H.264); FFmpeg then decodes in software
+    and scale_cuda fails on frames in system memory. The retry still encodes with NVENC.
+    
+    Args:
+        build_cmd: Builds the argv list; called with gpu_decode=True/False
+    """
+    result = run(build_cmd(has_nvenc()))
+    if result != 0 and has_nvenc():
+        print("⚠️  GPU decoding failed, retrying with CPU decoding")
+        result = run(build_cmd(False))
+    return result
+
+
+def video_codec_args(bitrate) -> list:
+    """HEVC encoder options: NVENC when available, otherwise Apple VideoToolbox."""
+    if has_nvenc():
+        return ["-c:v", "hevc_nvenc", "-preset", "p5", "-tag:v", "hvc1", "-b:v", str(bitrate)]
+    return ["-c:v", "hevc_videotoolbox", "-tag:v", "hvc1", "-b:v", str(bitrate)]
+
+
+def _threads_per_job(ctx: FileContext) -> int:
+    """Cores available to one FFmpeg process when ctx.jobs files are processed in parallel."""
+    return max(1, (os.cpu_count() or 1) // ctx.jobs)
+
+
+def filter_thread_args(ctx: FileContext) -> list:
+    """
+    Global FFmpeg filter threading options, placed once before -i.
+    With several files processed in parallel (ctx.jobs), cores are shared out
+    so the total thread count stays close to the core count.
+    """
+    threads = str(_threads_per_job(ctx))
+    return ["-filter_threads", threads, "-filter_complex_threads", threads]
+
+
+def encoder_thread_args(ctx: FileContext, outputs: int = 1) -> list:
+    """
+    Per-output encoder threads: the per-job budget is divided between the outputs
+    of one command. -threads 0 lets a single encoder pick automatically when running alone.
+    """
+    if ctx.jobs <= 1 and outputs <= 1:
+        return ["-threads", "0"]
+    return ["-threads", str(max(1, _threads_per_job(ctx) // outputs))]
+
+
 def get_video_bitrate(file_path: str) -> int:
     """
     Get the bitrate of a video file in bps (bits per second).
@@ -186,23 +296,23 @@ def print_video_info(resolution_str: str, fps: float, original_mbps: float, targ
 def compress_video(ctx: FileContext, scale, fps, bitrate=None) -> bool:
     # Parameter validation
     if not scale:
-        print(f"❌ Invalid scale parameter for {ctx.original_file_name}")
+        print(f"❌ Invalid scale parameter for {os.path.basename(ctx.original_file)}")
         return False
     
     if not fps or not isinstance(fps, (int, float)) or fps <= 0:
-        print(f"❌ Invalid fps parameter for {ctx.original_file_name}: {fps}")
+        print(f"❌ Invalid fps parameter for {os.path.basename(ctx.original_file)}: {fps}")
         return False
     
     # Set default bitrate
     video_bitrate = bitrate if bitrate else "8M"
     
     # Build command with audio processing
-    cmd = "{0} -i {1} -vf scale={2} -r {3} \
-        -c:v hevc_videotoolbox -tag:v hvc1 -b:v {4} \
-        -c:a aac -b:a 128k \
-        -map_metadata 0 {5} -y".format(
-        ffmpeg_bin, ctx.original_file_name, scale, fps, video_bitrate, ctx.temp_file_name
-    )
+    cmd = [
+        *ffmpeg_bin, "-i", ctx.original_file, "-vf", f"scale={scale}", "-r", str(fps),
+        "-c:v", "hevc_videotoolbox", "-tag:v", "hvc1", "-b:v", str(video_bitrate),
+        "-c:a", "aac", "-b:a", "128k",
+        "-map_metadata", "0", ctx.temp_file, "-y",
+    ]
     return execute(cmd, ctx)
 
 
@@ -211,6 +321,7 @@ def compress_drone_video(ctx: FileContext, scale="1920:1080", bitrate="15M", fps
     Compress drone video to fixed resolution and bitrate.
     Optimized for DJI drone videos - compresses to 1080p with fixed bitrate.
     Original videos are archived for preservation.
+    Encodes on NVIDIA GPUs (NVDEC + hevc_nvenc) when available, otherwise with VideoToolbox.
     
     Args:
         scale: Target resolution (default: "1920:1080" for 1080p)
@@ -241,13 +352,87 @@ def compress_drone_video(ctx: FileContext, scale="1920:1080", bitrate="15M", fps
         print(f"📊 {original_resolution} → 1920x1080 | {original_fps:.0f}fps → {fps:.0f}fps | Bitrate: {original_mbps:.1f}M → {target_mbps}M")
         
         # Build command with audio processing
-        cmd = "{0} -i {1} -vf scale={2} -r {3} \
-            -c:v hevc_videotoolbox -tag:v hvc1 -b:v {4} \
-            -c:a aac -b:a 128k \
-            -map_metadata 0 {5} -y".format(
-            ffmpeg_bin, ctx.original_file_name, scale, fps, bitrate, ctx.temp_file_name
-        )
-        return execute(cmd, ctx)
+        def build_cmd(gpu_decode: bool) -> list:
+            return [
+                *ffmpeg_bin, *filter_thread_args(ctx), *hwaccel_args(gpu_decode),
+                "-i", ctx.original_file, "-vf", f"{scale_filter(gpu_decode)}={scale}", "-r", str(fps),
+                *video_codec_args(bitrate), *encoder_thread_args(ctx),
+                "-c:a", "aac", "-b:a", "128k",
+                "-map_metadata", "0", ctx.temp_file, "-y",
+            ]
+        
+        print(f"🔄 Processing: {os.path.basename(ctx.original_file)}")
+        return finish_output(ctx, run_with_decode_fallback(build_cmd))
+    except Exception as e:
+        print(f"⚠️  Error processing {os.path.basename(ctx.original_file)}: {e}")
+        return False
+
+
+# Creating multiple outputs (https://trac.ffmpeg.org/wiki/Creating%20multiple%20outputs):
+# -filter_complex "[0:v]split=2[v1][v2];[v1]scale=1920:1080[o1];[v2]scale=1280:720[o2]"
+#                   # Decode the source once, split it and scale each copy independently
+# -map [o1] -map 0:a? -b:v 15M out1.mp4 -map "[o2]" -map 0:a? -b:v 8M out2.mp4
+#                   # Each output takes its own scaled stream plus the (optional) source audio
+def compress_drone_video_multi(ctx: FileContext, outputs, fps=None, reserved=None) -> bool:
+    """
+    Compress drone video into several renditions with a single FFmpeg run.
+    The source is decoded only once and shared by all encoders (NVENC when available).
+    Each rendition is saved as "<name>-<width>x<height>.<ext>" in the compressed directory.
+    
+    Args:
+        outputs: List of (scale, bitrate) pairs, e.g. [("1920:1080", "15M"), ("1280:720", "8M")]
+        fps: Target frame rate (default: None to keep original fps)
+    """
+    # Check if file exists
+    if not os.path.exists(ctx.original_file):
+        print(f"⚠️  Skipping: File not found - {os.path.basename(ctx.original_file)}")
+        return False
+    
+    if not outputs:
+        print(f"❌ No output specs given for {os.path.basename(ctx.original_file)}")
+        return False
+    
+    try:
+        # Use original fps if not specified
+        if fps is None:
+            original_fps = get_video_fps(ctx.original_file)
+            fps = original_fps if original_fps > 0 else 30
+        
+        # One context per rendition, so every output gets its own temp/final file
+        contexts = []
+        for scale, _ in outputs:
+            output_ctx = copy.copy(ctx)
+            output_ctx.set_suffix("-" + scale.replace(":", "x"))
+            contexts.append(output_ctx)
+        
+        def build_cmd(gpu_decode: bool) -> list:
+            splits = "".join("[v{0}]".format(i) for i in range(len(outputs)))
+            filters = ["[0:v]split={0}{1}".format(len(outputs), splits)]
+            filters += [
+                "[v{0}]{1}={2}[o{0}]".format(i, scale_filter(gpu_decode), scale)
+                for i, (scale, _) in enumerate(outputs)
+            ]
+            
+            cmd = [
+                *ffmpeg_bin, "-y", *filter_thread_args(ctx), *hwaccel_args(gpu_decode),
+                "-i", ctx.original_file, "-filter_complex", ";".join(filters),
+            ]
+            for i, ((scale, bitrate), output_ctx) in enumerate(zip(outputs, contexts)):
+                cmd += [
+                    "-map", f"[o{i}]", "-map", "0:a?", "-r", str(fps),
+                    *video_codec_args(bitrate), *encoder_thread_args(ctx, len(outputs)),
+                    "-c:a", "aac", "-b:a", "128k",
+                    "-map_metadata", "0", output_ctx.temp_file,
+                ]
+            return cmd
+        
+        for i, (scale, bitrate) in enumerate(outputs):
+            print(f"📊 Output {i + 1}: {scale} | {fps:.0f}fps | Bitrate: {bitrate}")
+        
+        print(f"🔄 Processing: {os.path.basename(ctx.original_file)}")
+        result = run_with_decode_fallback(build_cmd)
+        results = [finish_output(output_ctx, result) for output_ctx in contexts]
+        return all(results)
     except Exception as e:
         print(f"⚠️  Error processing {os.path.basename(ctx.original_file)}: {e}")
         return False
@@ -255,19 +440,18 @@ def compress_drone_video(ctx: FileContext, scale="1920:1080", bitrate="15M", fps
 
 def compress_rate(ctx: FileContext, video_rate="8M", audio_rate="128k", reserved=None) -> bool:
     """Compress video using specified video and audio bitrates."""
-    cmd = "{0} -i {1} -b:v {2} -b:a {3} {4}".format(
-        ffmpeg_bin, ctx.original_file_name, video_rate, audio_rate, ctx.temp_file_name
-    )
+    cmd = [*ffmpeg_bin, "-i", ctx.original_file, "-b:v", str(video_rate), "-b:a", str(audio_rate), ctx.temp_file]
     return execute(cmd, ctx)
 
 
 def convert_webm_to_mp4(ctx: FileContext, scale, reserved1=None, reserved2=None) -> bool:
     """Convert WebM video to MP4 format."""
     ctx.set_format("mp4")
-    cmd = "{0} -i {1} -vf scale={2} -c:v libx264 -pix_fmt yuv420p -crf 18 {3} -y".format(
-        ffmpeg_bin, ctx.original_file_name, scale, ctx.temp_file_name
-    )
-    result = os.system(cmd)
+    cmd = [
+        *ffmpeg_bin, "-i", ctx.original_file, "-vf", f"scale={scale}",
+        "-c:v", "libx264", "-pix_fmt", "yuv420p", "-crf", "18", ctx.temp_file, "-y",
+    ]
+    result = run(cmd)
     
     if result == 0 and os.path.exists(ctx.temp_file):
         ctx.archive_original_file()
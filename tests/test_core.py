@@ -0,0 +1,103 @@
+"""
+Tests for the file discovery and dispatch helpers of src/core.py.
+
+Run from the repository root:
+    python -m unittest discover tests
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import core
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, 'wb').close()
+
+
+class FileContextTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.addCleanup(core._ensured_dirs.clear)
+        self.src = os.path.join(self.tmp, 'DJI_0001.MP4')
+        _touch(self.src)
+
+    def test_paths_in_compressed_dir(self):
+        ctx = core.FileContext(self.src)
+        compressed = os.path.join(self.tmp, core.COMPRESSED_DIR)
+        self.assertTrue(os.path.isdir(compressed))
+        self.assertEqual(ctx.temp_file, os.path.join(compressed, 'DJI_0001-temp.MP4'))
+        self.assertEqual(ctx.final_file, os.path.join(compressed, 'DJI_0001.MP4'))
+
+    def test_set_suffix(self):
+        ctx = core.FileContext(self.src)
+        ctx.set_suffix('-1280x720')
+        self.assertEqual(os.path.basename(ctx.temp_file), 'DJI_0001-1280x720-temp.MP4')
+        self.assertEqual(os.path.basename(ctx.final_file), 'DJI_0001-1280x720.MP4')
+
+    def test_compressed_dir_created_once(self):
+        other = os.path.join(self.tmp, 'DJI_0002.MP4')
+        _touch(other)
+        with mock.patch.object(os, 'makedirs', wraps=os.makedirs) as makedirs:
+            core.FileContext(self.src)
+            core.FileContext(other)
+        makedirs.assert_called_once()
+
+
+class FindFilesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        for name in ('a.mp4', 'B.MP4', 'c.jpg', '._a.mp4', '.hidden/d.mp4', 'sub/e.mp4', 'sub/deeper/f.Mp4'):
+            _touch(os.path.join(self.tmp, name))
+
+    def _names(self, recursive):
+        return sorted(os.path.relpath(p, self.tmp) for p in core.find_files(self.tmp, '.MP4', recursive))
+
+    def test_top_level_only(self):
+        self.assertEqual(self._names(False), ['B.MP4', 'a.mp4'])
+
+    def test_recursive_skips_hidden(self):
+        self.assertEqual(
+            self._names(True),
+            ['B.MP4', 'a.mp4', os.path.join('sub', 'deeper', 'f.Mp4'), os.path.join('sub', 'e.mp4')],
+        )
+
+
+class ProcessFilesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.addCleanup(core._ensured_dirs.clear)
+        self.paths = [os.path.join(self.tmp, name) for name in ('a.mp4', 'b.mp4')]
+        for path in self.paths:
+            _touch(path)
+
+    def test_serial_passes_jobs_and_args(self):
+        calls = []
+        func = lambda ctx, var1, var2, var3: calls.append((ctx.original_file, ctx.jobs, var1, var2, var3))
+        core.process_files(iter(self.paths), func, '1920:1080', '15M', None, jobs=4)
+        self.assertEqual(calls, [(path, 4, '1920:1080', '15M', None) for path in self.paths])
+
+    def test_errors_do_not_stop_the_batch(self):
+        seen = []
+        def func(ctx, var1, var2, var3):
+            seen.append(ctx.original_file)
+            raise RuntimeError("boom")
+        with redirect_stdout(io.StringIO()):
+            core.process_files(self.paths, func)
+        self.assertEqual(seen, self.paths)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+"""
+Tests for the copy helpers and duplicate handling of scripts/extract_featured_raw.py.
+
+Run from the repository root:
+    python -m unittest discover tests
+"""
+
+import errno
+import io
+import os
+import pathlib
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import extract_featured_raw as efr
+
+# Fixed timestamp in the past, to check that copies keep the source mtime
+MTIME = 1_600_000_000
+
+
+def _unsupported(*args, **kwargs):
+    raise OSError(errno.EXDEV, "unsupported")
+
+
+@unittest.skipUnless(sys.platform.startswith('linux'), "kernel copy paths are Linux only")
+class FastCopyTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.src = os.path.join(self.tmp, 'src.jpg')
+        self.dst = os.path.join(self.tmp, 'dst.jpg')
+        # Larger than the copyfileobj buffer, so the loops run more than once
+        self.data = os.urandom(3 * efr.COPY_BUFSIZE + 123)
+        with open(self.src, 'wb') as f:
+            f.write(self.data)
+        os.utime(self.src, (MTIME, MTIME))
+
+    def assertCopied(self):
+        with open(self.dst, 'rb') as f:
+            self.assertEqual(f.read(), self.data)
+        self.assertEqual(int(os.stat(self.dst).st_mtime), MTIME)
+
+    @unittest.skipUnless(hasattr(os, 'copy_file_range'), "os.copy_file_range not available")
+    def test_copy_file_range(self):
+        with mock.patch.object(os, 'copy_file_range', wraps=os.copy_file_range) as cfr, \
+                mock.patch.object(os, 'sendfile', wraps=os.sendfile) as sendfile:
+            efr._fastcopy(self.src, self.dst)
+        self.assertTrue(cfr.called)
+        self.assertFalse(sendfile.called)
+        self.assertCopied()
+
+    def test_sendfile_fallback(self):
+        with mock.patch.object(os, 'copy_file_range', side_effect=_unsupported, create=True), \
+                mock.patch.object(os, 'sendfile', wraps=os.sendfile) as sendfile, \
+                mock.patch.object(shutil, 'copyfileobj', wraps=shutil.copyfileobj) as copyfileobj:
+            efr._fastcopy(self.src, self.dst)
+        self.assertTrue(sendfile.called)
+        self.assertFalse(copyfileobj.called)
+        self.assertCopied()
+
+    def test_sendfile_fallback_when_copy_file_range_copies_nothing(self):
+        with mock.patch.object(os, 'copy_file_range', return_value=0, create=True), \
+                mock.patch.object(os, 'sendfile', wraps=os.sendfile) as sendfile:
+            efr._fastcopy(self.src, self.dst)
+        self.assertTrue(sendfile.called)
+        self.assertCopied()
+
+    def test_copyfileobj_fallback(self):
+        with mock.patch.object(os, 'copy_file_range', side_effect=_unsupported, create=True), \
+                mock.patch.object(os, 'sendfile', side_effect=_unsupported), \
+                mock.patch.object(shutil, 'copyfileobj', wraps=shutil.copyfileobj) as copyfileobj:
+            efr._fastcopy(self.src, self.dst)
+        copyfileobj.assert_called_once()
+        self.assertEqual(copyfileobj.call_args.kwargs['length'], efr.COPY_BUFSIZE)
+        self.assertCopied()
+
+
+class DuplicateNamesTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.base = pathlib.Path(self.tmp)
+        self._make('raw/export', 'IMG_1.ARW', b'raw')
+        self._make('raw/export', 'IMG_2.ARW', b'raw')
+
+    def _make(self, subdir, name, data):
+        os.makedirs(os.path.join(self.tmp, subdir), exist_ok=True)
+        path = os.path.join(self.tmp, subdir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        os.utime(path, (MTIME, MTIME))
+
+    def _process(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.assertTrue(efr.process_files(self.base))
+        return out.getvalue()
+
+    def test_same_name_in_several_subdirs_copied_once(self):
+        self._make('jpg', 'IMG_1.jpg', b'first')
+        self._make('JPEG', 'img_1.JPG', b'second')
+        self._make('jpg', 'IMG_2.jpg', b'other')
+
+        out = self._process()
+
+        self.assertEqual(len(os.listdir(self.base / 'featured')), 2)
+        self.assertIn("Successfully copied: 2 files", out)
+        self.assertIn("Skipped (duplicates): 1 files", out)
+
+    def test_existing_featured_file_skipped(self):
+        self._make('jpg', 'IMG_1.jpg', b'new')
+        self._make('jpg', 'IMG_2.jpg', b'other')
+        self._make('featured', 'img_1.JPG', b'kept')
+
+        out = self._process()
+
+        with open(self.base / 'featured' / 'img_1.JPG', 'rb') as f:
+            self.assertEqual(f.read(), b'kept')
+        self.assertIn("Skipped (duplicates): 1 files", out)
+
+
+if __name__ == '__main__':
+    unittest.main()
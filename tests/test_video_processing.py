@@ -0,0 +1,144 @@
+"""
+Tests for the FFmpeg command lines built by src/video_processing.py.
+FFmpeg is not run: `run` and `has_nvenc` are patched.
+
+Run from the repository root:
+    python -m unittest discover tests
+"""
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src import core
+from src import video_processing as vp
+
+OUTPUTS = [("1920:1080", "15M"), ("1280:720", "8M")]
+
+
+class ThreadArgsTest(unittest.TestCase):
+    def setUp(self):
+        self.ctx = mock.Mock(jobs=1)
+        patcher = mock.patch.object(os, 'cpu_count', return_value=16)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_single_job_lets_encoder_choose(self):
+        self.assertEqual(vp.encoder_thread_args(self.ctx), ["-threads", "0"])
+        self.assertEqual(vp.filter_thread_args(self.ctx), ["-filter_threads", "16", "-filter_complex_threads", "16"])
+
+    def test_cores_shared_between_jobs_and_outputs(self):
+        self.ctx.jobs = 4
+        self.assertEqual(vp.filter_thread_args(self.ctx), ["-filter_threads", "4", "-filter_complex_threads", "4"])
+        self.assertEqual(vp.encoder_thread_args(self.ctx), ["-threads", "4"])
+        self.assertEqual(vp.encoder_thread_args(self.ctx, outputs=2), ["-threads", "2"])
+
+    def test_at_least_one_thread(self):
+        self.ctx.jobs = 64
+        self.assertEqual(vp.encoder_thread_args(self.ctx, outputs=3), ["-threads", "1"])
+
+
+class LimitParallelJobsTest(unittest.TestCase):
+    def test_unchanged_without_nvenc(self):
+        with mock.patch.object(vp, 'has_nvenc', return_value=False):
+            self.assertEqual(vp.limit_parallel_jobs(8), 8)
+
+    def test_capped_by_nvenc_sessions(self):
+        with mock.patch.object(vp, 'has_nvenc', return_value=True):
+            self.assertEqual(vp.limit_parallel_jobs(8), vp.NVENC_MAX_SESSIONS)
+            self.assertEqual(vp.limit_parallel_jobs(2), 2)
+            self.assertEqual(vp.limit_parallel_jobs(8, sessions_per_job=2), 1)
+            self.assertEqual(vp.limit_parallel_jobs(8, sessions_per_job=5), 1)
+
+
+class CompressDroneVideoMultiTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.addCleanup(core._ensured_dirs.clear)
+        self.src = os.path.join(self.tmp, 'DJI_0001.MP4')
+        with open(self.src, 'wb') as f:
+            f.write(b'x' * 1000)
+        self.ctx = core.FileContext(self.src)
+        self.cmds = []
+
+    def _run(self, *results):
+        """Fake `run`: records each argv and writes the temp outputs when it succeeds."""
+        results = iter(results)
+        def run(cmd):
+            self.cmds.append(cmd)
+            result = next(results)
+            if result == 0:
+                for arg in cmd:
+                    if '-temp.' in arg:
+                        with open(arg, 'wb') as f:
+                            f.write(b'x' * 100)
+            return result
+        return mock.patch.object(vp, 'run', side_effect=run)
+
+    def _compress(self, nvenc, *results):
+        with mock.patch.object(vp, 'has_nvenc', return_value=nvenc), self._run(*results), \
+                redirect_stdout(io.StringIO()):
+            return vp.compress_drone_video_multi(self.ctx, OUTPUTS, fps=30)
+
+    def _value(self, cmd, option):
+        return cmd[cmd.index(option) + 1]
+
+    def test_single_decode_split_into_outputs(self):
+        self.assertTrue(self._compress(False, 0))
+        cmd, = self.cmds
+        self.assertEqual(cmd.count("-i"), 1)
+        self.assertEqual(self._value(cmd, "-i"), self.src)
+        self.assertEqual(
+            self._value(cmd, "-filter_complex"),
+            "[0:v]split=2[v0][v1];[v0]scale=1920:1080[o0];[v1]scale=1280:720[o1]",
+        )
+        self.assertNotIn("-hwaccel", cmd)
+        self.assertEqual(cmd.count("-filter_threads"), 1)
+        self.assertLess(cmd.index("-filter_threads"), cmd.index("-i"))
+
+    def test_per_output_maps_and_temp_files(self):
+        self.assertTrue(self._compress(False, 0))
+        cmd, = self.cmds
+        compressed = os.path.join(self.tmp, core.COMPRESSED_DIR)
+        temp_files = [os.path.join(compressed, name) for name in
+                      ('DJI_0001-1920x1080-temp.MP4', 'DJI_0001-1280x720-temp.MP4')]
+        self.assertEqual([cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-map"],
+                         ["[o0]", "0:a?", "[o1]", "0:a?"])
+        self.assertEqual([cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-b:v"], ["15M", "8M"])
+        self.assertEqual([arg for arg in cmd if '-temp.' in arg], temp_files)
+        # Each output's options come before its own file name
+        self.assertLess(cmd.index("[o1]"), cmd.index(temp_files[1]))
+        self.assertGreater(cmd.index("[o1]"), cmd.index(temp_files[0]))
+        self.assertEqual(sorted(os.listdir(compressed)), ['DJI_0001-1280x720.MP4', 'DJI_0001-1920x1080.MP4'])
+
+    def test_nvenc_decodes_and_scales_on_gpu(self):
+        self.assertTrue(self._compress(True, 0))
+        cmd, = self.cmds
+        self.assertEqual(cmd[cmd.index("-hwaccel"):cmd.index("-i")],
+                         ["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"])
+        self.assertIn("[v1]scale_cuda=1280:720[o1]", self._value(cmd, "-filter_complex"))
+        self.assertEqual([cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-c:v"], ["hevc_nvenc", "hevc_nvenc"])
+
+    def test_cpu_decode_retry_after_gpu_failure(self):
+        self.assertTrue(self._compress(True, 1, 0))
+        gpu_cmd, cpu_cmd = self.cmds
+        self.assertIn("-hwaccel", gpu_cmd)
+        self.assertNotIn("-hwaccel", cpu_cmd)
+        self.assertNotIn("scale_cuda", self._value(cpu_cmd, "-filter_complex"))
+        self.assertEqual(self._value(cpu_cmd, "-c:v"), "hevc_nvenc")
+
+    def test_failure_removes_outputs(self):
+        self.assertFalse(self._compress(False, 1))
+        self.assertEqual(os.listdir(os.path.join(self.tmp, core.COMPRESSED_DIR)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()